@@ -20,12 +20,27 @@ Create Date: 2015-10-19 02:08:54.252877
 revision = '68fcb81878c5'
 down_revision = 'f8dc1eb9deaf'
 
+import functools
+
 from alembic import op
 from alembic import util
 import sqlalchemy as sa
 from sqlalchemy.engine import reflection
 
 
+@functools.lru_cache(maxsize=None)
+def _load_data_migrations():
+    # Importing data_migrations transitively pulls in the AIM and ML2
+    # driver stacks; defer it until needed and memoize the result so
+    # multi-database upgrades resolve (or fail) the import only once.
+    try:
+        from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import (
+            data_migrations)
+        return data_migrations
+    except ImportError:
+        return None
+
+
 def upgrade():
 
     bind = op.get_bind()
@@ -36,20 +51,27 @@ def upgrade():
                       sa.Column('network_id',
                                 sa.String(length=36),
                                 nullable=False))
-        try:
-            from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import (
-                data_migrations)
-
-            session = sa.orm.Session(bind=bind, autocommit=True)
-            with session.begin(subtransactions=True):
-                data_migrations.do_ha_ip_duplicate_entries_removal(session)
-                data_migrations.do_ha_ip_network_id_insertion(session)
-        except ImportError:
-            util.warn("AIM schema present, but failed to import AIM libraries"
-                      " - HA IP duplicate entries removal not completed.")
-        except Exception as e:
-            util.warn("Caught exception while migrating data in %s: %s"
-                      % ('apic_ml2_ha_ipaddress_to_port_owner', e))
+        # Skip the data migration entirely when the table has no rows
+        # (fresh deployments), avoiding the AIM import and session work.
+        row = bind.execute(
+            sa.text("SELECT 1 FROM apic_ml2_ha_ipaddress_to_port_owner "
+                    "LIMIT 1")).first()
+        if row:
+            data_migrations = _load_data_migrations()
+            if data_migrations is None:
+                util.warn("AIM schema present, but failed to import AIM "
+                          "libraries - HA IP duplicate entries removal not "
+                          "completed.")
+            else:
+                try:
+                    session = sa.orm.Session(bind=bind, autocommit=True)
+                    with session.begin(subtransactions=True):
+                        data_migrations.do_ha_ip_duplicate_entries_removal(
+                            session)
+                        data_migrations.do_ha_ip_network_id_insertion(session)
+                except Exception as e:
+                    util.warn("Caught exception while migrating data in %s: %s"
+                              % ('apic_ml2_ha_ipaddress_to_port_owner', e))
 
         inspector = reflection.Inspector.from_engine(op.get_bind())
         pk_constraint = inspector.get_pk_constraint(
@@ -15,6 +15,10 @@
 
 import ast
 import functools
+import ipaddress
+import json
+import sys
+import types
 
 from neutron_lib.api import converters as conv
 from neutron_lib.api.definitions import address_scope as as_def
@@ -24,7 +28,6 @@ from neutron_lib.api.definitions import subnet as subnet_def
 from neutron_lib.api import extensions
 from neutron_lib.api import validators as valid
 from oslo_log import log as logging
-import six
 
 from gbpservice._i18n import _
 
@@ -58,6 +61,14 @@ MULTI_EXT_NETS = 'apic:multi_ext_nets'
 ADVERTISED_EXTERNALLY = 'apic:advertised_externally'
 SHARED_BETWEEN_VRFS = 'apic:shared_between_vrfs'
 
+# The 'apic:' prefix keeps these keys from being interned automatically
+# by the compiler; intern them explicitly so the per-request dict
+# lookups against request bodies can short-circuit on identity.
+for _name, _value in list(globals().items()):
+    if isinstance(_value, str) and _value.startswith('apic:'):
+        globals()[_name] = sys.intern(_value)
+del _name, _value
+
 BD = 'BridgeDomain'
 EPG = 'EndpointGroup'
 SUBNET = 'Subnet'
@@ -81,49 +92,133 @@ ERSPAN_DEST_IP = 'dest_ip'
 ERSPAN_FLOW_ID = 'flow_id'
 ERSPAN_DIRECTION = 'direction'
 
+_VLAN_RANGE_KEYS = frozenset((VLAN_RANGE_START, VLAN_RANGE_END))
+_ERSPAN_KEYS = frozenset((ERSPAN_DEST_IP, ERSPAN_FLOW_ID))
+
 LOG = logging.getLogger(__name__)
 
 
-def _validate_apic_vlan(data, key_specs=None):
-    if data is None:
-        return
+def _parse_string_value(value):
+    # Most string payloads are JSON-compatible, so try the fast
+    # C-implemented parser first, falling back to ast.literal_eval
+    # for legacy single-quoted dict/list representations.
     try:
-        val = int(data)
-        if val >= APIC_MIN_VLAN and val <= APIC_MAX_VLAN:
-            return
-        msg = ("Invalid value for VLAN: '%s'") % data
+        return json.loads(value)
+    except ValueError:
+        return ast.literal_eval(value)
+
+
+def _verify_expected_keys(expected, data, strict=True):
+    """Inline replacement for valid._verify_dict_keys for small key sets.
+
+    Avoids a cross-module call and set construction per element when
+    validating lists of small fixed-shape dicts.
+    """
+    if not isinstance(data, dict):
+        msg = ("Invalid input. '%s' must be a dictionary "
+               "with keys: %s") % (data, sorted(expected))
         LOG.debug(msg)
         return msg
-    except (ValueError, TypeError):
-        msg = ("Invalid data format for VLAN: '%s'") % data
+    keys = data.keys()
+    if expected - keys or (strict and len(keys) != len(expected)):
+        msg = ("Validation of dictionary's keys failed. "
+               "Expected keys: %s "
+               "Provided keys: %s") % (sorted(expected), sorted(keys))
         LOG.debug(msg)
         return msg
 
 
+def _as_vlan(data):
+    """Parse and range-check a VLAN value.
+
+    Returns a (value, message) tuple, where value is the parsed int and
+    message is None, or value is None and message describes why the data
+    is not a valid VLAN.
+    """
+    if type(data) is int:
+        val = data
+    else:
+        try:
+            val = int(data)
+        except (ValueError, TypeError):
+            msg = ("Invalid data format for VLAN: '%s'") % data
+            LOG.debug(msg)
+            return None, msg
+    if APIC_MIN_VLAN <= val <= APIC_MAX_VLAN:
+        return val, None
+    msg = ("Invalid value for VLAN: '%s'") % data
+    LOG.debug(msg)
+    return None, msg
+
+
+def _validate_apic_vlan(data, key_specs=None):
+    if data is None:
+        return
+    return _as_vlan(data)[1]
+
+
 def _validate_apic_vlan_range(data, key_specs=None):
     if data is None:
         return
 
-    expected_keys = [VLAN_RANGE_START, VLAN_RANGE_END]
-    msg = valid._verify_dict_keys(expected_keys, data)
+    msg = _verify_expected_keys(_VLAN_RANGE_KEYS, data)
     if msg:
         return msg
-    for k in expected_keys:
-        msg = _validate_apic_vlan(data[k])
-        if msg:
-            return msg
-    if int(data[VLAN_RANGE_START]) > int(data[VLAN_RANGE_END]):
+    start, msg = _as_vlan(data[VLAN_RANGE_START])
+    if msg:
+        return msg
+    end, msg = _as_vlan(data[VLAN_RANGE_END])
+    if msg:
+        return msg
+    if start > end:
         msg = ("Invalid start, end for VLAN range %s") % data
         return msg
 
 
+def _validate_apic_vlan_list(data, key_specs=None):
+    """Validate a list of unique APIC VLAN values.
+
+    Specialized form of _validate_list_of_items(_validate_apic_vlan, ...)
+    that inlines the per-item range check; allowed-VLAN payloads can run
+    to thousands of entries, so the per-element dispatch matters.
+    """
+    if not isinstance(data, list):
+        msg = ("'%s' is not a list") % data
+        LOG.debug(msg)
+        return msg
+    seen = set()
+    for vlan in data:
+        if vlan is not None:
+            if type(vlan) is int:
+                val = vlan
+            else:
+                try:
+                    val = int(vlan)
+                except (ValueError, TypeError):
+                    msg = ("Invalid data format for VLAN: '%s'") % vlan
+                    LOG.debug(msg)
+                    return msg
+            if not APIC_MIN_VLAN <= val <= APIC_MAX_VLAN:
+                msg = ("Invalid value for VLAN: '%s'") % vlan
+                LOG.debug(msg)
+                return msg
+        if vlan in seen:
+            msg = ("Duplicate items in the list: '%s'") % data
+            LOG.debug(msg)
+            return msg
+        seen.add(vlan)
+
+
 def _validate_erspan_flow_id(data, key_specs=None):
     if data is None:
         return
     msg = valid.validate_non_negative(data)
-    if int(data) > 1023:
+    if msg:
+        return msg
+    flow_id = int(data)
+    if flow_id > 1023:
         msg = ("ERSPAN flow ID must be less than 1023 (was %s)") % data
-    elif int(data) == 0:
+    elif flow_id == 0:
         msg = ("ERSPAN flow ID must be greater than 0 (was %s)") % data
     return msg
 
@@ -143,32 +238,45 @@ def _validate_erspan_configs(data, valid_values=None):
         LOG.debug(msg)
         return msg
 
-    expected_keys = (ERSPAN_DEST_IP, ERSPAN_FLOW_ID,)
-    erspan_configs = []
+    seen_configs = set()
     for erspan_config in data:
-        msg = valid._verify_dict_keys(expected_keys, erspan_config, False)
+        msg = _verify_expected_keys(_ERSPAN_KEYS, erspan_config,
+                                    strict=False)
         if msg:
             return msg
         msg = _validate_erspan_flow_id(erspan_config[ERSPAN_FLOW_ID])
         if msg:
             return msg
-        msg = valid.validate_ip_address(erspan_config[ERSPAN_DEST_IP])
-        if msg:
+        # ipaddress.ip_address also accepts plain ints; only strings
+        # are valid API input here.
+        dest_ip = erspan_config[ERSPAN_DEST_IP]
+        try:
+            if not isinstance(dest_ip, str):
+                raise ValueError()
+            ipaddress.ip_address(dest_ip)
+        except ValueError:
+            msg = ("'%s' is not a valid IP address") % dest_ip
+            LOG.debug(msg)
             return msg
-        if erspan_config in erspan_configs:
+        # Dedupe on the canonical validated keys only; extra keys are
+        # tolerated above and may hold unhashable values.
+        config_key = (erspan_config[ERSPAN_DEST_IP],
+                      erspan_config[ERSPAN_FLOW_ID],
+                      erspan_config.get(ERSPAN_DIRECTION))
+        if config_key in seen_configs:
             msg = ("Duplicate ERSPAN config '%s'") % erspan_config
             LOG.debug(msg)
             return msg
-        erspan_configs.append(erspan_config)
+        seen_configs.add(config_key)
 
 
 def _validate_dict_or_string(data, key_specs=None):
     if data is None:
         return
 
-    if isinstance(data, str) or isinstance(data, six.string_types):
+    if isinstance(data, str):
         try:
-            data = ast.literal_eval(data)
+            data = _parse_string_value(data)
         except Exception:
             msg = _("Extension %s cannot be converted to dict") % data
             return msg
@@ -179,46 +287,85 @@ def _validate_dict_or_string(data, key_specs=None):
 def convert_apic_vlan(value):
     if value is None:
         return
-    else:
-        return int(value)
+    # Values that already went through conversion (or arrived as JSON
+    # numbers) are ints; skip the redundant parse.
+    if type(value) is int:
+        return value
+    return int(value)
 
 
 def convert_apic_none_to_empty_list(value):
     if value is None:
         return []
-    if isinstance(value, str) or isinstance(value, six.string_types):
-        value = ast.literal_eval(value)
+    if isinstance(value, str):
+        value = _parse_string_value(value)
     return value
 
 
+def _merge_vlan_ranges(ranges):
+    """Coalesce overlapping or adjacent (start, end) VLAN ranges.
+
+    Large configurations can carry many overlapping ranges; merging
+    them first ensures each VLAN is expanded at most once.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
 def convert_nested_domain_allowed_vlans(value):
     if value is None:
         return
 
-    if isinstance(value, str) or isinstance(value, six.string_types):
-        value = ast.literal_eval(value)
+    if isinstance(value, str):
+        value = _parse_string_value(value)
+
+    has_list = VLANS_LIST in value
+    has_ranges = VLAN_RANGES in value
 
-    vlans_list = []
-    if VLANS_LIST in value:
-        for vlan in value[VLANS_LIST]:
-            vlans_list.append(convert_apic_vlan(vlan))
-    if VLAN_RANGES in value:
+    # Specialize for the common single-key shapes before falling back
+    # to the general set accumulator.
+    if has_list and not has_ranges:
+        value[VLANS_LIST] = sorted(
+            {convert_apic_vlan(vlan) for vlan in value[VLANS_LIST]})
+        return value
+
+    ranges = []
+    if has_ranges:
         for vlan_range in value[VLAN_RANGES]:
-            for vrng in [VLAN_RANGE_START, VLAN_RANGE_END]:
-                vlan_range[vrng] = convert_apic_vlan(vlan_range[vrng])
-            vlans_list.extend(list(range(vlan_range[VLAN_RANGE_START],
-                vlan_range[VLAN_RANGE_END] + 1)))
-    # eliminate duplicates
-    vlans_list = list(set(vlans_list))
-    # sort
-    vlans_list.sort()
-    value[VLANS_LIST] = vlans_list
+            start = convert_apic_vlan(vlan_range[VLAN_RANGE_START])
+            end = convert_apic_vlan(vlan_range[VLAN_RANGE_END])
+            vlan_range[VLAN_RANGE_START] = start
+            vlan_range[VLAN_RANGE_END] = end
+            ranges.append((start, end))
+
+    if has_ranges and not has_list:
+        # Merged ranges are sorted and disjoint, so they expand directly
+        # into a sorted, duplicate-free list without set hashing.
+        vlans_list = []
+        for start, end in _merge_vlan_ranges(ranges):
+            vlans_list.extend(range(start, end + 1))
+        value[VLANS_LIST] = vlans_list
+        return value
+
+    # Both keys present (or neither): accumulate into a set so
+    # duplicates are eliminated inline.
+    vlans = set()
+    if has_list:
+        vlans.update(convert_apic_vlan(vlan) for vlan in value[VLANS_LIST])
+    for start, end in _merge_vlan_ranges(ranges):
+        vlans.update(range(start, end + 1))
+    value[VLANS_LIST] = sorted(vlans)
     return value
 
 
 valid.validators['type:apic_vlan'] = _validate_apic_vlan
-valid.validators['type:apic_vlan_list'] = functools.partial(
-        valid._validate_list_of_items, _validate_apic_vlan)
+valid.validators['type:apic_vlan_list'] = _validate_apic_vlan_list
 valid.validators['type:apic_vlan_range_list'] = functools.partial(
         valid._validate_list_of_items, _validate_apic_vlan_range)
 valid.validators['type:dict_or_string'] = _validate_dict_or_string
@@ -445,40 +592,46 @@ ADDRESS_SCOPE_ATTRIBUTES = {
 }
 
 
-EXTENDED_ATTRIBUTES_2_0 = {
-    port_def.COLLECTION_NAME: dict(
-        list(APIC_ATTRIBUTES.items()) + list(PORT_ATTRIBUTES.items())),
-    net_def.COLLECTION_NAME: dict(
-        list(APIC_ATTRIBUTES.items()) + list(EXT_NET_ATTRIBUTES.items()) +
-        list(NET_ATTRIBUTES.items())),
-    subnet_def.COLLECTION_NAME: dict(
-        list(APIC_ATTRIBUTES.items()) + list(EXT_SUBNET_ATTRIBUTES.items())),
-    as_def.COLLECTION_NAME: dict(
-        list(APIC_ATTRIBUTES.items()) + list(ADDRESS_SCOPE_ATTRIBUTES.items()))
-}
+# Merged once at import time; get_extended_resources returns a read-only
+# view so callers cannot mutate the shared map.
+EXTENDED_ATTRIBUTES_2_0 = types.MappingProxyType({
+    port_def.COLLECTION_NAME: {**APIC_ATTRIBUTES, **PORT_ATTRIBUTES},
+    net_def.COLLECTION_NAME: {**APIC_ATTRIBUTES, **EXT_NET_ATTRIBUTES,
+                              **NET_ATTRIBUTES},
+    subnet_def.COLLECTION_NAME: {**APIC_ATTRIBUTES, **EXT_SUBNET_ATTRIBUTES},
+    as_def.COLLECTION_NAME: {**APIC_ATTRIBUTES, **ADDRESS_SCOPE_ATTRIBUTES},
+})
+
+_EMPTY_RESOURCES = types.MappingProxyType({})
+
+_RESOURCES_BY_VERSION = {'2.0': EXTENDED_ATTRIBUTES_2_0}
 
 
 class Cisco_apic(extensions.ExtensionDescriptor):
 
+    # Metadata as plain class attributes; the classmethods the extension
+    # framework requires just return them.
+    name = "Cisco APIC"
+    alias = ALIAS
+    description = ("Extension exposing mapping of Neutron resources to Cisco "
+                   "APIC constructs")
+    updated = "2016-03-31T12:00:00-00:00"
+
     @classmethod
     def get_name(cls):
-        return "Cisco APIC"
+        return cls.name
 
     @classmethod
     def get_alias(cls):
-        return ALIAS
+        return cls.alias
 
     @classmethod
     def get_description(cls):
-        return ("Extension exposing mapping of Neutron resources to Cisco "
-                "APIC constructs")
+        return cls.description
 
     @classmethod
     def get_updated(cls):
-        return "2016-03-31T12:00:00-00:00"
+        return cls.updated
 
     def get_extended_resources(self, version):
-        if version == "2.0":
-            return EXTENDED_ATTRIBUTES_2_0
-        else:
-            return {}
+        return _RESOURCES_BY_VERSION.get(version, _EMPTY_RESOURCES)
@@ -25,7 +25,6 @@ from neutron_lib.services import base as service_base
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import uuidutils
-import six
 
 from gbpservice._i18n import _
 from gbpservice.neutron import extensions as gbp_extensions
@@ -1028,8 +1027,8 @@ class Group_policy(extensions.ExtensionDescriptor):
             return {}
 
 
-@six.add_metaclass(abc.ABCMeta)
-class GroupPolicyPluginBase(service_base.ServicePluginBase):
+class GroupPolicyPluginBase(service_base.ServicePluginBase,
+                            metaclass=abc.ABCMeta):
 
     def get_plugin_name(self):
         return constants.GROUP_POLICY
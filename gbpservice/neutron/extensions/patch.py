@@ -233,7 +233,6 @@ attributes.AttributeInfo.fill_post_defaults = fill_post_defaults
 # AIM_FLC_L7_PARAMS to be reset over and over. By patching at this point,
 # we make sure we always have the proper value for that variable.
 try:
-    import six
     import sys
 
     from networking_sfc.db import flowclassifier_db
@@ -278,7 +277,7 @@ try:
         tenant_id = fc['tenant_id']
         l7_parameters = {
             key: flowclassifier_db.L7Parameter(keyword=key, value=val)
-            for key, val in six.iteritems(fc['l7_parameters'])}
+            for key, val in fc['l7_parameters'].items()}
         ethertype = fc['ethertype']
         protocol = fc['protocol']
         source_port_range_min = fc['source_port_range_min']
@@ -385,88 +385,101 @@ class ExtensionDbMixin(object):
         return net_res
 
     def set_network_extn_db(self, session, network_id, res_dict):
+        self.set_networks_extn_db(session, {network_id: res_dict})
+
+    def set_networks_extn_db(self, session, res_dict_by_id):
+        if not res_dict_by_id:
+            return
+
         with session.begin(subtransactions=True):
             query = BAKERY(lambda s: s.query(
                 NetworkExtensionDb))
-            query += lambda q: q.filter_by(
-                network_id=sa.bindparam('network_id'))
-            db_obj = query(session).params(
-                network_id=network_id).first()
-
-            db_obj = db_obj or NetworkExtensionDb(network_id=network_id)
-            if cisco_apic.EXTERNAL_NETWORK in res_dict:
-                db_obj['external_network_dn'] = (
-                    res_dict[cisco_apic.EXTERNAL_NETWORK])
-            if cisco_apic.BD in res_dict:
-                db_obj['bridge_domain_dn'] = (
-                    res_dict[cisco_apic.BD])
-            if cisco_apic.NAT_TYPE in res_dict:
-                db_obj['nat_type'] = res_dict[cisco_apic.NAT_TYPE]
-            if cisco_apic.SVI in res_dict:
-                db_obj['svi'] = res_dict[cisco_apic.SVI]
-            if cisco_apic.BGP in res_dict:
-                db_obj['bgp_enable'] = res_dict[cisco_apic.BGP]
-            if cisco_apic.BGP_TYPE in res_dict:
-                db_obj['bgp_type'] = res_dict[cisco_apic.BGP_TYPE]
-            if cisco_apic.BGP_ASN in res_dict:
-                db_obj['bgp_asn'] = res_dict[cisco_apic.BGP_ASN]
-            if cisco_apic.NESTED_DOMAIN_NAME in res_dict:
-                db_obj['nested_domain_name'] = res_dict[
-                        cisco_apic.NESTED_DOMAIN_NAME]
-            if cisco_apic.NESTED_DOMAIN_TYPE in res_dict:
-                db_obj['nested_domain_type'] = res_dict[
-                        cisco_apic.NESTED_DOMAIN_TYPE]
-            if cisco_apic.NESTED_DOMAIN_INFRA_VLAN in res_dict:
-                db_obj['nested_domain_infra_vlan'] = res_dict[
-                        cisco_apic.NESTED_DOMAIN_INFRA_VLAN]
-            if cisco_apic.NESTED_DOMAIN_SERVICE_VLAN in res_dict:
-                db_obj['nested_domain_service_vlan'] = res_dict[
-                        cisco_apic.NESTED_DOMAIN_SERVICE_VLAN]
-            if cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN in res_dict:
-                db_obj['nested_domain_node_network_vlan'] = res_dict[
-                        cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN]
-            if cisco_apic.POLICY_ENFORCEMENT_PREF in res_dict:
-                db_obj['policy_enforcement_pref'] = res_dict[
-                        cisco_apic.POLICY_ENFORCEMENT_PREF]
-            if cisco_apic.MULTI_EXT_NETS in res_dict:
-                db_obj['multi_ext_nets'] = res_dict[cisco_apic.MULTI_EXT_NETS]
-            session.add(db_obj)
-
-            if cisco_apic.EXTERNAL_CIDRS in res_dict:
-                self._update_list_attr(session, NetworkExtensionCidrDb, 'cidr',
-                                       res_dict[cisco_apic.EXTERNAL_CIDRS],
-                                       network_id=network_id)
-
-            if cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS in res_dict:
-                self._update_list_attr(
-                        session, NetworkExtNestedDomainAllowedVlansDb, 'vlan',
-                        res_dict[cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS],
-                        network_id=network_id)
-
-            if cisco_apic.EXTRA_PROVIDED_CONTRACTS in res_dict:
-                self._update_list_attr(
-                        session, NetworkExtExtraContractDb, 'contract_name',
-                        res_dict[cisco_apic.EXTRA_PROVIDED_CONTRACTS],
-                        network_id=network_id, provides=True)
-
-            if cisco_apic.EXTRA_CONSUMED_CONTRACTS in res_dict:
-                self._update_list_attr(
-                        session, NetworkExtExtraContractDb, 'contract_name',
-                        res_dict[cisco_apic.EXTRA_CONSUMED_CONTRACTS],
-                        network_id=network_id, provides=False)
-
-            if cisco_apic.EPG_CONTRACT_MASTERS in res_dict:
-                self._update_dict_attr(
-                        session, NetworkExtEpgContractMasterDb,
-                        ('app_profile_name', 'name'),
-                        res_dict[cisco_apic.EPG_CONTRACT_MASTERS],
-                        network_id=network_id)
+            query += lambda q: q.filter(
+                NetworkExtensionDb.network_id.in_(
+                    sa.bindparam('network_ids', expanding=True)))
+            db_objs = {o.network_id: o for o in query(session).params(
+                network_ids=list(res_dict_by_id)).all()}
+
+            for network_id, res_dict in res_dict_by_id.items():
+                db_obj = db_objs.get(network_id) or NetworkExtensionDb(
+                    network_id=network_id)
+                self._set_network_extn_db_row(session, db_obj, network_id,
+                                              res_dict)
+
+    def _set_network_extn_db_row(self, session, db_obj, network_id, res_dict):
+        if cisco_apic.EXTERNAL_NETWORK in res_dict:
+            db_obj['external_network_dn'] = (
+                res_dict[cisco_apic.EXTERNAL_NETWORK])
+        if cisco_apic.BD in res_dict:
+            db_obj['bridge_domain_dn'] = (
+                res_dict[cisco_apic.BD])
+        if cisco_apic.NAT_TYPE in res_dict:
+            db_obj['nat_type'] = res_dict[cisco_apic.NAT_TYPE]
+        if cisco_apic.SVI in res_dict:
+            db_obj['svi'] = res_dict[cisco_apic.SVI]
+        if cisco_apic.BGP in res_dict:
+            db_obj['bgp_enable'] = res_dict[cisco_apic.BGP]
+        if cisco_apic.BGP_TYPE in res_dict:
+            db_obj['bgp_type'] = res_dict[cisco_apic.BGP_TYPE]
+        if cisco_apic.BGP_ASN in res_dict:
+            db_obj['bgp_asn'] = res_dict[cisco_apic.BGP_ASN]
+        if cisco_apic.NESTED_DOMAIN_NAME in res_dict:
+            db_obj['nested_domain_name'] = res_dict[
+                    cisco_apic.NESTED_DOMAIN_NAME]
+        if cisco_apic.NESTED_DOMAIN_TYPE in res_dict:
+            db_obj['nested_domain_type'] = res_dict[
+                    cisco_apic.NESTED_DOMAIN_TYPE]
+        if cisco_apic.NESTED_DOMAIN_INFRA_VLAN in res_dict:
+            db_obj['nested_domain_infra_vlan'] = res_dict[
+                    cisco_apic.NESTED_DOMAIN_INFRA_VLAN]
+        if cisco_apic.NESTED_DOMAIN_SERVICE_VLAN in res_dict:
+            db_obj['nested_domain_service_vlan'] = res_dict[
+                    cisco_apic.NESTED_DOMAIN_SERVICE_VLAN]
+        if cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN in res_dict:
+            db_obj['nested_domain_node_network_vlan'] = res_dict[
+                    cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN]
+        if cisco_apic.POLICY_ENFORCEMENT_PREF in res_dict:
+            db_obj['policy_enforcement_pref'] = res_dict[
+                    cisco_apic.POLICY_ENFORCEMENT_PREF]
+        if cisco_apic.MULTI_EXT_NETS in res_dict:
+            db_obj['multi_ext_nets'] = res_dict[cisco_apic.MULTI_EXT_NETS]
+        session.add(db_obj)
 
-            if cisco_apic.NO_NAT_CIDRS in res_dict:
-                self._update_list_attr(session, NetworkExtensionNoNatCidrsDb,
-                                       'cidr',
-                                       res_dict[cisco_apic.NO_NAT_CIDRS],
-                                       network_id=network_id)
+        if cisco_apic.EXTERNAL_CIDRS in res_dict:
+            self._update_list_attr(session, NetworkExtensionCidrDb, 'cidr',
+                                   res_dict[cisco_apic.EXTERNAL_CIDRS],
+                                   network_id=network_id)
+
+        if cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS in res_dict:
+            self._update_list_attr(
+                    session, NetworkExtNestedDomainAllowedVlansDb, 'vlan',
+                    res_dict[cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS],
+                    network_id=network_id)
+
+        if cisco_apic.EXTRA_PROVIDED_CONTRACTS in res_dict:
+            self._update_list_attr(
+                    session, NetworkExtExtraContractDb, 'contract_name',
+                    res_dict[cisco_apic.EXTRA_PROVIDED_CONTRACTS],
+                    network_id=network_id, provides=True)
+
+        if cisco_apic.EXTRA_CONSUMED_CONTRACTS in res_dict:
+            self._update_list_attr(
+                    session, NetworkExtExtraContractDb, 'contract_name',
+                    res_dict[cisco_apic.EXTRA_CONSUMED_CONTRACTS],
+                    network_id=network_id, provides=False)
+
+        if cisco_apic.EPG_CONTRACT_MASTERS in res_dict:
+            self._update_dict_attr(
+                    session, NetworkExtEpgContractMasterDb,
+                    ('app_profile_name', 'name'),
+                    res_dict[cisco_apic.EPG_CONTRACT_MASTERS],
+                    network_id=network_id)
+
+        if cisco_apic.NO_NAT_CIDRS in res_dict:
+            self._update_list_attr(session, NetworkExtensionNoNatCidrsDb,
+                                   'cidr',
+                                   res_dict[cisco_apic.NO_NAT_CIDRS],
+                                   network_id=network_id)
 
     def get_network_ids_by_ext_net_dn(self, session, dn, lock_update=False):
         query = BAKERY(lambda s: s.query(
@@ -559,55 +572,79 @@ class ExtensionDbMixin(object):
         return [i[0] for i in cidrs]
 
     def get_subnet_extn_db(self, session, subnet_id):
+        return self.get_subnet_extn_db_bulk(session, [subnet_id]).get(
+            subnet_id, {})
+
+    def get_subnet_extn_db_bulk(self, session, subnet_ids):
+        if not subnet_ids:
+            return {}
+
         query = BAKERY(lambda s: s.query(
             SubnetExtensionDb))
-        query += lambda q: q.filter_by(
-            subnet_id=sa.bindparam('subnet_id'))
-        db_obj = query(session).params(
-            subnet_id=subnet_id).first()
+        query += lambda q: q.filter(
+            SubnetExtensionDb.subnet_id.in_(
+                sa.bindparam('subnet_ids', expanding=True)))
+        db_objs = query(session).params(
+            subnet_ids=subnet_ids).all()
 
         result = {}
+        for db_obj in db_objs:
+            result[db_obj.subnet_id] = self.make_subnet_extn_db_conf_dict(
+                db_obj)
+        return result
+
+    def make_subnet_extn_db_conf_dict(self, db_obj):
+        subnet_res = {}
         if db_obj:
-            self._set_if_not_none(result, cisco_apic.SNAT_HOST_POOL,
+            self._set_if_not_none(subnet_res, cisco_apic.SNAT_HOST_POOL,
                                   db_obj['snat_host_pool'])
-            self._set_if_not_none(result, cisco_apic.ACTIVE_ACTIVE_AAP,
+            self._set_if_not_none(subnet_res, cisco_apic.ACTIVE_ACTIVE_AAP,
                                   db_obj['active_active_aap'])
-            self._set_if_not_none(result, cisco_apic.SNAT_SUBNET_ONLY,
+            self._set_if_not_none(subnet_res, cisco_apic.SNAT_SUBNET_ONLY,
                                   db_obj['snat_subnet_only'])
-            self._set_if_not_none(result, cisco_apic.EPG_SUBNET,
+            self._set_if_not_none(subnet_res, cisco_apic.EPG_SUBNET,
                                   db_obj['epg_subnet'])
-            self._set_if_not_none(result, cisco_apic.ADVERTISED_EXTERNALLY,
+            self._set_if_not_none(subnet_res, cisco_apic.ADVERTISED_EXTERNALLY,
                                   db_obj['advertised_externally'])
-            self._set_if_not_none(result, cisco_apic.SHARED_BETWEEN_VRFS,
+            self._set_if_not_none(subnet_res, cisco_apic.SHARED_BETWEEN_VRFS,
                                   db_obj['shared_between_vrfs'])
-        return result
+        return subnet_res
 
     def set_subnet_extn_db(self, session, subnet_id, res_dict):
+        self.set_subnets_extn_db(session, {subnet_id: res_dict})
+
+    def set_subnets_extn_db(self, session, res_dict_by_id):
+        if not res_dict_by_id:
+            return
+
         query = BAKERY(lambda s: s.query(
             SubnetExtensionDb))
-        query += lambda q: q.filter_by(
-            subnet_id=sa.bindparam('subnet_id'))
-        db_obj = query(session).params(
-            subnet_id=subnet_id).first()
-
-        db_obj = db_obj or SubnetExtensionDb(subnet_id=subnet_id)
-        if cisco_apic.SNAT_HOST_POOL in res_dict:
-            db_obj['snat_host_pool'] = res_dict[cisco_apic.SNAT_HOST_POOL]
-        if cisco_apic.ACTIVE_ACTIVE_AAP in res_dict:
-            db_obj['active_active_aap'] = res_dict[
-                                            cisco_apic.ACTIVE_ACTIVE_AAP]
-        if cisco_apic.SNAT_SUBNET_ONLY in res_dict:
-            db_obj['snat_subnet_only'] = res_dict[
-                                            cisco_apic.SNAT_SUBNET_ONLY]
-        if cisco_apic.EPG_SUBNET in res_dict:
-            db_obj['epg_subnet'] = res_dict[cisco_apic.EPG_SUBNET]
-        if cisco_apic.ADVERTISED_EXTERNALLY in res_dict:
-            db_obj['advertised_externally'] = res_dict[
+        query += lambda q: q.filter(
+            SubnetExtensionDb.subnet_id.in_(
+                sa.bindparam('subnet_ids', expanding=True)))
+        db_objs = {o.subnet_id: o for o in query(session).params(
+            subnet_ids=list(res_dict_by_id)).all()}
+
+        for subnet_id, res_dict in res_dict_by_id.items():
+            db_obj = db_objs.get(subnet_id) or SubnetExtensionDb(
+                subnet_id=subnet_id)
+            if cisco_apic.SNAT_HOST_POOL in res_dict:
+                db_obj['snat_host_pool'] = res_dict[cisco_apic.SNAT_HOST_POOL]
+            if cisco_apic.ACTIVE_ACTIVE_AAP in res_dict:
+                db_obj['active_active_aap'] = res_dict[
+                                                cisco_apic.ACTIVE_ACTIVE_AAP]
+            if cisco_apic.SNAT_SUBNET_ONLY in res_dict:
+                db_obj['snat_subnet_only'] = res_dict[
+                                                cisco_apic.SNAT_SUBNET_ONLY]
+            if cisco_apic.EPG_SUBNET in res_dict:
+                db_obj['epg_subnet'] = res_dict[cisco_apic.EPG_SUBNET]
+            if cisco_apic.ADVERTISED_EXTERNALLY in res_dict:
+                db_obj['advertised_externally'] = res_dict[
                                             cisco_apic.ADVERTISED_EXTERNALLY]
-        if cisco_apic.SHARED_BETWEEN_VRFS in res_dict:
-            db_obj['shared_between_vrfs'] = res_dict[
-                                            cisco_apic.SHARED_BETWEEN_VRFS]
-        session.add(db_obj)
+            if cisco_apic.SHARED_BETWEEN_VRFS in res_dict:
+                db_obj['shared_between_vrfs'] = res_dict[
+                                                cisco_apic.SHARED_BETWEEN_VRFS]
+            session.add(db_obj)
 
     def get_router_extn_db(self, session, router_id):
         query = BAKERY(lambda s: s.query(
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from aim.api import resource as aim_res
 from aim import exceptions as aim_exc
 from neutron.api import extensions
@@ -31,6 +33,86 @@ from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import db
 
 LOG = log.getLogger(__name__)
 
+# Network extension attributes that could be updated.
+_UPDATE_ATTRS = frozenset((
+    cisco_apic.EXTERNAL_CIDRS, cisco_apic.BGP, cisco_apic.BGP_TYPE,
+    cisco_apic.BGP_ASN,
+    cisco_apic.NESTED_DOMAIN_NAME, cisco_apic.NESTED_DOMAIN_TYPE,
+    cisco_apic.NESTED_DOMAIN_INFRA_VLAN,
+    cisco_apic.NESTED_DOMAIN_SERVICE_VLAN,
+    cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN,
+    cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS,
+    cisco_apic.EXTRA_PROVIDED_CONTRACTS,
+    cisco_apic.EXTRA_CONSUMED_CONTRACTS,
+    cisco_apic.EPG_CONTRACT_MASTERS,
+    cisco_apic.POLICY_ENFORCEMENT_PREF,
+    cisco_apic.NO_NAT_CIDRS,
+    cisco_apic.MULTI_EXT_NETS))
+
+# The updatable attributes copied verbatim from the request data;
+# external CIDRs and the allowed-VLANs dict have dedicated handling.
+_EXT_KEYS = _UPDATE_ATTRS - {cisco_apic.EXTERNAL_CIDRS,
+                             cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS}
+
+
+# The BGP-related attributes checked by validate_bgp_params.
+_BGP_KEYS = frozenset((cisco_apic.BGP, cisco_apic.BGP_TYPE,
+                       cisco_apic.BGP_ASN))
+
+# Subnet extension attributes that could be updated.
+_SUBNET_UPDATE_KEYS = (
+    cisco_apic.SNAT_HOST_POOL,
+    cisco_apic.SNAT_SUBNET_ONLY,
+    cisco_apic.ADVERTISED_EXTERNALLY,
+    cisco_apic.SHARED_BETWEEN_VRFS,
+)
+
+# Subnet extension attributes and their API defaults, applied when the
+# extension DB has no value for a subnet.
+_SUBNET_EXT_DEFAULTS = (
+    (cisco_apic.SNAT_HOST_POOL, False),
+    (cisco_apic.ACTIVE_ACTIVE_AAP, False),
+    (cisco_apic.SNAT_SUBNET_ONLY, False),
+    (cisco_apic.EPG_SUBNET, False),
+    (cisco_apic.ADVERTISED_EXTERNALLY, True),
+    (cisco_apic.SHARED_BETWEEN_VRFS, False),
+)
+
+
+# DN parsing is pure string work; orchestration workflows repeatedly
+# create resources against the same DNs, so memoize the parsed AIM
+# resources. Invalid DNs are not cached and re-raise on each call.
+@functools.lru_cache(maxsize=1024)
+def _external_network_from_dn(dn):
+    return aim_res.ExternalNetwork.from_dn(dn)
+
+
+@functools.lru_cache(maxsize=1024)
+def _bridge_domain_from_dn(dn):
+    return aim_res.BridgeDomain.from_dn(dn)
+
+
+@functools.lru_cache(maxsize=1024)
+def _vrf_from_dn(dn):
+    return aim_res.VRF.from_dn(dn)
+
+
+def _reraise_retriable(fn):
+    # Shared wrapper for the extend_* methods: log retriable exceptions
+    # at debug level, everything else as an error, and reraise.
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            with excutils.save_and_reraise_exception():
+                if db_api.is_retriable(e):
+                    LOG.debug("APIC AIM %s got retriable exception: %s",
+                              fn.__name__, type(e))
+                else:
+                    LOG.exception("APIC AIM %s failed", fn.__name__)
+    return wrapper
+
 
 class ApicExtensionDriver(api_plus.ExtensionDriver,
                           db.DbMixin,
@@ -38,52 +120,40 @@ class ApicExtensionDriver(api_plus.ExtensionDriver,
 
     def __init__(self):
         LOG.info("APIC AIM ED __init__")
-        self._mechanism_driver = None
 
     def initialize(self):
         LOG.info("APIC AIM ED initializing")
         extensions.append_api_extensions_path(extensions_pkg.__path__)
 
-    @property
+    @functools.cached_property
     def _md(self):
-        if not self._mechanism_driver:
-            # REVISIT(rkukura): It might be safer to search the MDs by
-            # class rather than index by name, or to use a class
-            # variable to find the instance.
-            plugin = directory.get_plugin()
-            mech_mgr = plugin.mechanism_manager
-            self._mechanism_driver = mech_mgr.mech_drivers['apic_aim'].obj
-        return self._mechanism_driver
+        # REVISIT(rkukura): It might be safer to search the MDs by
+        # class rather than index by name, or to use a class
+        # variable to find the instance.
+        plugin = directory.get_plugin()
+        mech_mgr = plugin.mechanism_manager
+        return mech_mgr.mech_drivers['apic_aim'].obj
 
     @property
     def extension_alias(self):
         return "cisco-apic"
 
+    @_reraise_retriable
     def extend_port_dict(self, session, base_model, result):
-        try:
-            self._md.extend_port_dict(session, base_model, result)
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_port_dict got retriable "
-                              "exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_port_dict failed")
+        self._md.extend_port_dict(session, base_model, result)
 
+    @_reraise_retriable
     def extend_port_dict_bulk(self, session, results):
-        try:
-            self._md.extend_port_dict_bulk(session, results)
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_port_dict_bulk got retriable "
-                              "exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_port_dict_bulk failed")
+        self._md.extend_port_dict_bulk(session, results)
 
     def process_create_port(self, plugin_context, data, result):
-        res_dict = {cisco_apic.ERSPAN_CONFIG:
-                    data.get(cisco_apic.ERSPAN_CONFIG, [])}
+        erspan_config = data.get(cisco_apic.ERSPAN_CONFIG)
+        if not erspan_config:
+            # Nothing to persist for a new port without ERSPAN config;
+            # just reflect the default in the result.
+            result[cisco_apic.ERSPAN_CONFIG] = []
+            return
+        res_dict = {cisco_apic.ERSPAN_CONFIG: erspan_config}
         self.set_port_extn_db(plugin_context.session, result['id'],
                               res_dict)
         result.update(res_dict)
@@ -96,29 +166,19 @@ class ApicExtensionDriver(api_plus.ExtensionDriver,
                               res_dict)
         result.update(res_dict)
 
+    @_reraise_retriable
     def extend_network_dict(self, session, base_model, result):
-        try:
-            self._md.extend_network_dict(session, base_model, result)
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_network_dict got retriable "
-                              "exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_network_dict failed")
+        self._md.extend_network_dict(session, base_model, result)
 
+    @_reraise_retriable
     def extend_network_dict_bulk(self, session, results):
-        try:
-            self._md.extend_network_dict_bulk(session, results)
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_network_dict got retriable "
-                              "exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_network_dict failed")
+        self._md.extend_network_dict_bulk(session, results)
 
     def validate_bgp_params(self, data, result=None):
+        # Without any BGP keys the defaults below always pass, so skip
+        # the probes entirely for the common non-BGP request.
+        if _BGP_KEYS.isdisjoint(data):
+            return
         if result:
             is_svi = result.get(cisco_apic.SVI)
         else:
@@ -165,233 +225,131 @@ class ApicExtensionDriver(api_plus.ExtensionDriver,
                     data.get(cisco_apic.NO_NAT_CIDRS),
                     cisco_apic.MULTI_EXT_NETS: use_multi_ext_nets,
                     }
-        if cisco_apic.VLANS_LIST in (data.get(
-                cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS) or {}):
-            res_dict.update({cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS:
-                data.get(cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS)[
-                    cisco_apic.VLANS_LIST]})
+        allowed_vlans = data.get(cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS) or {}
+        if cisco_apic.VLANS_LIST in allowed_vlans:
+            res_dict[cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS] = (
+                allowed_vlans[cisco_apic.VLANS_LIST])
         self.set_network_extn_db(plugin_context.session, result['id'],
                                  res_dict)
         result.update(res_dict)
 
-        if (data.get(cisco_apic.DIST_NAMES) and
-            data[cisco_apic.DIST_NAMES].get(cisco_apic.EXTERNAL_NETWORK)):
-            dn = data[cisco_apic.DIST_NAMES][cisco_apic.EXTERNAL_NETWORK]
+        dn_map = data.get(cisco_apic.DIST_NAMES) or {}
+        ext_net_dn = dn_map.get(cisco_apic.EXTERNAL_NETWORK)
+        bd_dn = dn_map.get(cisco_apic.BD)
+        if ext_net_dn or bd_dn:
+            dist_names = result.setdefault(cisco_apic.DIST_NAMES, {})
+        if ext_net_dn:
             try:
-                aim_res.ExternalNetwork.from_dn(dn)
+                _external_network_from_dn(ext_net_dn)
             except aim_exc.InvalidDNForAciResource:
                 raise n_exc.InvalidInput(
-                    error_message=('%s is not valid ExternalNetwork DN' % dn))
-            if is_svi:
-                res_dict = {cisco_apic.EXTERNAL_NETWORK: dn}
-            else:
-                res_dict = {cisco_apic.EXTERNAL_NETWORK: dn,
-                            cisco_apic.NAT_TYPE:
-                            data.get(cisco_apic.NAT_TYPE, 'distributed'),
-                            cisco_apic.EXTERNAL_CIDRS:
-                            data.get(
-                                cisco_apic.EXTERNAL_CIDRS, ['0.0.0.0/0'])}
+                    error_message=('%s is not valid ExternalNetwork DN' %
+                                   ext_net_dn))
+            res_dict = {cisco_apic.EXTERNAL_NETWORK: ext_net_dn}
+            if not is_svi:
+                res_dict[cisco_apic.NAT_TYPE] = data.get(
+                    cisco_apic.NAT_TYPE, 'distributed')
+                res_dict[cisco_apic.EXTERNAL_CIDRS] = data.get(
+                    cisco_apic.EXTERNAL_CIDRS, ['0.0.0.0/0'])
             self.set_network_extn_db(plugin_context.session, result['id'],
                                      res_dict)
-            result.setdefault(cisco_apic.DIST_NAMES, {})[
-                    cisco_apic.EXTERNAL_NETWORK] = res_dict.pop(
-                        cisco_apic.EXTERNAL_NETWORK)
+            dist_names[cisco_apic.EXTERNAL_NETWORK] = ext_net_dn
+            del res_dict[cisco_apic.EXTERNAL_NETWORK]
             result.update(res_dict)
-        if (data.get(cisco_apic.DIST_NAMES) and
-            data[cisco_apic.DIST_NAMES].get(cisco_apic.BD)):
-            dn = data[cisco_apic.DIST_NAMES][cisco_apic.BD]
+        if bd_dn:
             try:
-                aim_res.BridgeDomain.from_dn(dn)
+                _bridge_domain_from_dn(bd_dn)
             except aim_exc.InvalidDNForAciResource:
                 raise n_exc.InvalidInput(
-                    error_message=('%s is not valid BridgeDomain DN' % dn))
-            res_dict = {cisco_apic.BD: dn}
+                    error_message=('%s is not valid BridgeDomain DN' % bd_dn))
             self.set_network_extn_db(plugin_context.session, result['id'],
-                                     res_dict)
-            result.setdefault(cisco_apic.DIST_NAMES, {})[
-                    cisco_apic.BD] = res_dict.pop(
-                        cisco_apic.BD)
-            result.update(res_dict)
+                                     {cisco_apic.BD: bd_dn})
+            dist_names[cisco_apic.BD] = bd_dn
 
     def process_update_network(self, plugin_context, data, result):
-        # Extension attributes that could be updated.
-        update_attrs = [
-                cisco_apic.EXTERNAL_CIDRS, cisco_apic.BGP, cisco_apic.BGP_TYPE,
-                cisco_apic.BGP_ASN,
-                cisco_apic.NESTED_DOMAIN_NAME, cisco_apic.NESTED_DOMAIN_TYPE,
-                cisco_apic.NESTED_DOMAIN_INFRA_VLAN,
-                cisco_apic.NESTED_DOMAIN_SERVICE_VLAN,
-                cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN,
-                cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS,
-                cisco_apic.EXTRA_PROVIDED_CONTRACTS,
-                cisco_apic.EXTRA_CONSUMED_CONTRACTS,
-                cisco_apic.EPG_CONTRACT_MASTERS,
-                cisco_apic.POLICY_ENFORCEMENT_PREF,
-                cisco_apic.NO_NAT_CIDRS,
-                cisco_apic.MULTI_EXT_NETS]
-        if not (set(update_attrs) & set(data.keys())):
+        if _UPDATE_ATTRS.isdisjoint(data):
             return
 
         res_dict = {}
         if result.get(cisco_apic.DIST_NAMES, {}).get(
             cisco_apic.EXTERNAL_NETWORK):
             if cisco_apic.EXTERNAL_CIDRS in data:
-                res_dict.update({cisco_apic.EXTERNAL_CIDRS:
-                    data[cisco_apic.EXTERNAL_CIDRS]})
+                res_dict[cisco_apic.EXTERNAL_CIDRS] = (
+                    data[cisco_apic.EXTERNAL_CIDRS])
         self.validate_bgp_params(data, result)
 
-        ext_keys = [cisco_apic.BGP, cisco_apic.BGP_TYPE, cisco_apic.BGP_ASN,
-                cisco_apic.NESTED_DOMAIN_NAME, cisco_apic.NESTED_DOMAIN_TYPE,
-                cisco_apic.NESTED_DOMAIN_INFRA_VLAN,
-                cisco_apic.NESTED_DOMAIN_SERVICE_VLAN,
-                cisco_apic.NESTED_DOMAIN_NODE_NETWORK_VLAN,
-                cisco_apic.EXTRA_PROVIDED_CONTRACTS,
-                cisco_apic.EXTRA_CONSUMED_CONTRACTS,
-                cisco_apic.EPG_CONTRACT_MASTERS,
-                cisco_apic.POLICY_ENFORCEMENT_PREF,
-                cisco_apic.NO_NAT_CIDRS,
-                cisco_apic.MULTI_EXT_NETS]
-        for e_k in ext_keys:
-            if e_k in data:
-                res_dict.update({e_k: data[e_k]})
-
-        if cisco_apic.VLANS_LIST in (data.get(
-                cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS) or {}):
-            res_dict.update({cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS:
-                data.get(cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS)[
-                    cisco_apic.VLANS_LIST]})
+        res_dict.update({e_k: data[e_k] for e_k in _EXT_KEYS & data.keys()})
+
+        allowed_vlans = data.get(cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS) or {}
+        if cisco_apic.VLANS_LIST in allowed_vlans:
+            res_dict[cisco_apic.NESTED_DOMAIN_ALLOWED_VLANS] = (
+                allowed_vlans[cisco_apic.VLANS_LIST])
 
         if res_dict:
             self.set_network_extn_db(plugin_context.session, result['id'],
                                      res_dict)
             result.update(res_dict)
 
+    @_reraise_retriable
     def extend_subnet_dict(self, session, base_model, result):
-        try:
-            self._md.extend_subnet_dict(session, base_model, result)
-            res_dict = self.get_subnet_extn_db(session, result['id'])
-            result[cisco_apic.SNAT_HOST_POOL] = (
-                res_dict.get(cisco_apic.SNAT_HOST_POOL, False))
-            result[cisco_apic.ACTIVE_ACTIVE_AAP] = (
-                res_dict.get(cisco_apic.ACTIVE_ACTIVE_AAP, False))
-            result[cisco_apic.SNAT_SUBNET_ONLY] = (
-                res_dict.get(cisco_apic.SNAT_SUBNET_ONLY, False))
-            result[cisco_apic.EPG_SUBNET] = (
-                res_dict.get(cisco_apic.EPG_SUBNET, False))
-            result[cisco_apic.ADVERTISED_EXTERNALLY] = (
-                res_dict.get(cisco_apic.ADVERTISED_EXTERNALLY, True))
-            result[cisco_apic.SHARED_BETWEEN_VRFS] = (
-                res_dict.get(cisco_apic.SHARED_BETWEEN_VRFS, False))
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_subnet_dict got retriable "
-                              "exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_subnet_dict failed")
+        self._md.extend_subnet_dict(session, base_model, result)
+        res_dict = self.get_subnet_extn_db(session, result['id'])
+        result.update({k: res_dict.get(k, d)
+                       for k, d in _SUBNET_EXT_DEFAULTS})
 
+    @_reraise_retriable
     def extend_subnet_dict_bulk(self, session, results):
-        try:
-            self._md.extend_subnet_dict_bulk(session, results)
-            for result, subnet_db in results:
-                res_dict = self.get_subnet_extn_db(session, subnet_db['id'])
-                result[cisco_apic.SNAT_HOST_POOL] = (
-                    res_dict.get(cisco_apic.SNAT_HOST_POOL, False))
-                result[cisco_apic.ACTIVE_ACTIVE_AAP] = (
-                    res_dict.get(cisco_apic.ACTIVE_ACTIVE_AAP, False))
-                result[cisco_apic.SNAT_SUBNET_ONLY] = (
-                    res_dict.get(cisco_apic.SNAT_SUBNET_ONLY, False))
-                result[cisco_apic.EPG_SUBNET] = (
-                    res_dict.get(cisco_apic.EPG_SUBNET, False))
-                result[cisco_apic.ADVERTISED_EXTERNALLY] = (
-                    res_dict.get(cisco_apic.ADVERTISED_EXTERNALLY, True))
-                result[cisco_apic.SHARED_BETWEEN_VRFS] = (
-                    res_dict.get(cisco_apic.SHARED_BETWEEN_VRFS, False))
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_subnet_dict_bulk got retriable "
-                              "exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_subnet_dict_bulk failed")
+        self._md.extend_subnet_dict_bulk(session, results)
+        extn_resources = self.get_subnet_extn_db_bulk(
+            session, [subnet_db['id'] for _, subnet_db in results])
+        for result, subnet_db in results:
+            res_dict = extn_resources.get(subnet_db['id'], {})
+            result.update({k: res_dict.get(k, d)
+                           for k, d in _SUBNET_EXT_DEFAULTS})
 
     def process_create_subnet(self, plugin_context, data, result):
-        res_dict = {cisco_apic.SNAT_HOST_POOL:
-                    data.get(cisco_apic.SNAT_HOST_POOL, False),
-                    cisco_apic.ACTIVE_ACTIVE_AAP:
-                    data.get(cisco_apic.ACTIVE_ACTIVE_AAP, False),
-                    cisco_apic.SNAT_SUBNET_ONLY:
-                    data.get(cisco_apic.SNAT_SUBNET_ONLY, False),
-                    cisco_apic.EPG_SUBNET:
-                    data.get(cisco_apic.EPG_SUBNET, False),
-                    cisco_apic.ADVERTISED_EXTERNALLY:
-                    data.get(cisco_apic.ADVERTISED_EXTERNALLY, True),
-                    cisco_apic.SHARED_BETWEEN_VRFS:
-                    data.get(cisco_apic.SHARED_BETWEEN_VRFS, False)}
+        res_dict = {k: data.get(k, d) for k, d in _SUBNET_EXT_DEFAULTS}
         self.set_subnet_extn_db(plugin_context.session, result['id'],
                                 res_dict)
         result.update(res_dict)
 
     def process_update_subnet(self, plugin_context, data, result):
-        if (cisco_apic.SNAT_HOST_POOL not in data and
-                cisco_apic.SNAT_SUBNET_ONLY not in data and
-                cisco_apic.ADVERTISED_EXTERNALLY not in data and
-                cisco_apic.SHARED_BETWEEN_VRFS not in data):
+        res_dict = {k: data[k] for k in _SUBNET_UPDATE_KEYS if k in data}
+        if not res_dict:
             return
 
-        res_dict = {}
-        if cisco_apic.SNAT_HOST_POOL in data:
-            res_dict.update({cisco_apic.SNAT_HOST_POOL:
-                             data[cisco_apic.SNAT_HOST_POOL]})
-
-        if cisco_apic.SNAT_SUBNET_ONLY in data:
-            res_dict.update({cisco_apic.SNAT_SUBNET_ONLY:
-                             data[cisco_apic.SNAT_SUBNET_ONLY]})
-
-        if cisco_apic.ADVERTISED_EXTERNALLY in data:
-            res_dict.update({cisco_apic.ADVERTISED_EXTERNALLY:
-                             data[cisco_apic.ADVERTISED_EXTERNALLY]})
-
-        if cisco_apic.SHARED_BETWEEN_VRFS in data:
-            res_dict.update({cisco_apic.SHARED_BETWEEN_VRFS:
-                             data[cisco_apic.SHARED_BETWEEN_VRFS]})
-
+        result.update(res_dict)
         self.set_subnet_extn_db(plugin_context.session, result['id'],
                                 res_dict)
-        result.update(res_dict)
 
+    @_reraise_retriable
     def extend_address_scope_dict(self, session, base_model, result):
-        try:
-            self._md.extend_address_scope_dict(session, base_model, result)
-        except Exception as e:
-            with excutils.save_and_reraise_exception():
-                if db_api.is_retriable(e):
-                    LOG.debug("APIC AIM extend_address_scope_dict got "
-                              "retriable exception: %s", type(e))
-                else:
-                    LOG.exception("APIC AIM extend_address_scope_dict failed")
+        self._md.extend_address_scope_dict(session, base_model, result)
 
     def process_create_address_scope(self, plugin_context, data, result):
         if (data.get(cisco_apic.DIST_NAMES) and
             data[cisco_apic.DIST_NAMES].get(cisco_apic.VRF)):
             dn = data[cisco_apic.DIST_NAMES][cisco_apic.VRF]
             try:
-                vrf = aim_res.VRF.from_dn(dn)
+                vrf = _vrf_from_dn(dn)
             except aim_exc.InvalidDNForAciResource:
                 raise n_exc.InvalidInput(
                     error_message=('%s is not valid VRF DN' % dn))
 
-            # Check if another address scope already maps to this VRF.
+            # Check if another address scope already maps to this VRF,
+            # keeping the check and the insert in one transaction.
             session = plugin_context.session
-            mappings = self._get_address_scope_mappings_for_vrf(session, vrf)
-            vrf_owned = False
-            for mapping in mappings:
-                if mapping.address_scope.ip_version == data['ip_version']:
-                    raise n_exc.InvalidInput(
-                        error_message=(
-                            'VRF %s is already in use by address-scope %s' %
-                            (dn, mapping.scope_id)))
-                vrf_owned = mapping.vrf_owned
-
-            self._add_address_scope_mapping(
-                session, result['id'], vrf, vrf_owned)
+            with session.begin(subtransactions=True):
+                mappings = self._get_address_scope_mappings_for_vrf(
+                    session, vrf)
+                vrf_owned = False
+                for mapping in mappings:
+                    if mapping.address_scope.ip_version == data['ip_version']:
+                        raise n_exc.InvalidInput(
+                            error_message=(
+                                'VRF %s is already in use by address-scope '
+                                '%s' % (dn, mapping.scope_id)))
+                    vrf_owned = mapping.vrf_owned
+
+                self._add_address_scope_mapping(
+                    session, result['id'], vrf, vrf_owned)
@@ -22,6 +22,9 @@ LOG = logging.getLogger(__name__)
 
 client = None
 
+_FULL_SEARCH_OPTS = {'all_tenants': 1}
+_DELTA_SEARCH_OPTS = {'all_tenants': 1, 'deleted': 'false'}
+
 
 def _get_client():
     global client
@@ -46,13 +49,14 @@ class NovaClient(object):
 
     def get_servers(self, is_full_update, changes_since_in_sec):
         if is_full_update:
-            search_opts = {'all_tenants': 1}
+            search_opts = _FULL_SEARCH_OPTS
         else:
-            seconds_ago = (datetime.datetime.now() -
-                        datetime.timedelta(seconds=changes_since_in_sec))
-            search_opts = {'all_tenants': 1,
-                           'changes-since': str(seconds_ago),
-                           'deleted': 'false'}
+            # Nova's changes-since filter expects a UTC ISO8601
+            # timestamp; isoformat also avoids str()'s datetime repr.
+            seconds_ago = (datetime.datetime.utcnow() -
+                datetime.timedelta(seconds=changes_since_in_sec)).isoformat()
+            search_opts = dict(_DELTA_SEARCH_OPTS,
+                               **{'changes-since': seconds_ago})
         try:
             return self.client.servers.list(detailed=False,
                                             search_opts=search_opts,
@@ -8132,6 +8132,56 @@ class TestExtensionAttributes(ApicAimTestCase):
             self.assertFalse(extn.get_subnet_extn_db(ctx.session,
                                                      sbv_subnet['id']))
 
+    def test_extension_db_bulk(self):
+        ctx = n_context.get_admin_context()
+        extn = extn_db.ExtensionDbMixin()
+
+        net1 = self._make_network(self.fmt, 'net1', True)['network']
+        net2 = self._make_network(self.fmt, 'net2', True)['network']
+        subnet1 = self._make_subnet(
+            self.fmt, {'network': net1}, '10.0.1.1', '10.0.1.0/24')['subnet']
+        subnet2 = self._make_subnet(
+            self.fmt, {'network': net2}, '10.0.2.1', '10.0.2.0/24')['subnet']
+
+        # Simulate prior existing resources (i.e. no extension rows), so
+        # the bulk setters mix updating net1/subnet1's existing rows with
+        # inserting new rows for net2/subnet2.
+        with db_api.CONTEXT_WRITER.using(ctx):
+            db_obj = ctx.session.query(extn_db.NetworkExtensionDb).filter(
+                extn_db.NetworkExtensionDb.network_id == net2['id']).one()
+            ctx.session.delete(db_obj)
+            db_obj = ctx.session.query(extn_db.SubnetExtensionDb).filter(
+                extn_db.SubnetExtensionDb.subnet_id == subnet2['id']).one()
+            ctx.session.delete(db_obj)
+
+        with db_api.CONTEXT_WRITER.using(ctx):
+            extn.set_networks_extn_db(ctx.session, {
+                net1['id']: {'apic:nested_domain_name': 'myk8s',
+                             'apic:nested_domain_allowed_vlans': [2, 3, 4]},
+                net2['id']: {'apic:nested_domain_name': 'otherk8s'}})
+            extn.set_subnets_extn_db(ctx.session, {
+                subnet1['id']: {SNAT_POOL: True},
+                subnet2['id']: {SNAT_SUBNET_ONLY: True}})
+
+        with db_api.CONTEXT_READER.using(ctx):
+            net_res = extn.get_network_extn_db_bulk(
+                ctx.session, [net1['id'], net2['id']])
+            subnet_res = extn.get_subnet_extn_db_bulk(
+                ctx.session, [subnet1['id'], subnet2['id']])
+            self.assertEqual(
+                {}, extn.get_subnet_extn_db_bulk(ctx.session, []))
+
+        self.assertEqual('myk8s',
+                         net_res[net1['id']]['apic:nested_domain_name'])
+        self.assertItemsEqual(
+            [2, 3, 4],
+            net_res[net1['id']]['apic:nested_domain_allowed_vlans'])
+        self.assertEqual('otherk8s',
+                         net_res[net2['id']]['apic:nested_domain_name'])
+        self.assertTrue(subnet_res[subnet1['id']][SNAT_POOL])
+        self.assertTrue(subnet_res[subnet2['id']][SNAT_SUBNET_ONLY])
+        self.assertNotIn(SNAT_POOL, subnet_res[subnet2['id']])
+
     def test_router_lifecycle(self):
         ctx = n_context.get_admin_context()
         extn = extn_db.ExtensionDbMixin()
@@ -24,6 +24,71 @@ class TestAttributeValidators(base.BaseTestCase):
         self.assertIsNone(apic_ext._validate_apic_vlan(None))
         self.assertIsNone(apic_ext._validate_apic_vlan('10'))
         self.assertIsNone(apic_ext._validate_apic_vlan(10))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan('bad'))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan(0))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan(4094))
+
+    def test_validate_apic_vlan_list(self):
+        self.assertIsNone(apic_ext._validate_apic_vlan_list([]))
+        self.assertIsNone(apic_ext._validate_apic_vlan_list([2, '3', 4]))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan_list('2'))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan_list(['bad']))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan_list([0]))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan_list([4094]))
+        self.assertIsNotNone(apic_ext._validate_apic_vlan_list([2, 3, 2]))
+
+    def test_validate_apic_vlan_range(self):
+        self.assertIsNone(apic_ext._validate_apic_vlan_range(None))
+        self.assertIsNone(
+            apic_ext._validate_apic_vlan_range({'start': 2, 'end': 4}))
+        self.assertIsNotNone(
+            apic_ext._validate_apic_vlan_range({'start': 2}))
+        self.assertIsNotNone(
+            apic_ext._validate_apic_vlan_range(
+                {'start': 2, 'end': 4, 'extra': 5}))
+        self.assertIsNotNone(
+            apic_ext._validate_apic_vlan_range({'start': 4, 'end': 2}))
+        self.assertIsNotNone(
+            apic_ext._validate_apic_vlan_range({'start': 'bad', 'end': 4}))
+
+    def test_verify_expected_keys(self):
+        expected = frozenset(('start', 'end'))
+        self.assertIsNone(
+            apic_ext._verify_expected_keys(
+                expected, {'start': 2, 'end': 4}))
+        self.assertIsNone(
+            apic_ext._verify_expected_keys(
+                expected, {'start': 2, 'end': 4, 'extra': 5}, strict=False))
+        self.assertIsNotNone(
+            apic_ext._verify_expected_keys(
+                expected, {'start': 2, 'end': 4, 'extra': 5}))
+        self.assertIsNotNone(
+            apic_ext._verify_expected_keys(expected, {'start': 2}))
+        self.assertIsNotNone(
+            apic_ext._verify_expected_keys(
+                expected, {'start': 2}, strict=False))
+        self.assertIsNotNone(
+            apic_ext._verify_expected_keys(expected, [2, 4]))
+
+    def test_validate_erspan_configs(self):
+        self.assertIsNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': '1.1.1.1', 'flow_id': 1},
+             {'dest_ip': '1.1.1.2', 'flow_id': 1, 'direction': 'in'}]))
+        # Extra keys are tolerated, even with unhashable values.
+        self.assertIsNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': '1.1.1.1', 'flow_id': 1, 'junk': [1]}]))
+        self.assertIsNotNone(apic_ext._validate_erspan_configs('bad'))
+        self.assertIsNotNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': '1.1.1.1'}]))
+        self.assertIsNotNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': 'bad', 'flow_id': 1}]))
+        self.assertIsNotNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': 3232235777, 'flow_id': 1}]))
+        self.assertIsNotNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': '1.1.1.1', 'flow_id': 1024}]))
+        self.assertIsNotNone(apic_ext._validate_erspan_configs(
+            [{'dest_ip': '1.1.1.1', 'flow_id': 1},
+             {'dest_ip': '1.1.1.1', 'flow_id': 1}]))
 
 
 class TestAttributeConverters(base.BaseTestCase):
@@ -83,4 +148,16 @@ class TestAttributeConverters(base.BaseTestCase):
         self.assertItemsEqual(
                 apic_ext.convert_nested_domain_allowed_vlans(
                     test_dict)['vlans_list'], expt_list)
+        test_dict = {'vlans_list': ['4', '2', '3', '3']}
+        expt_list = [2, 3, 4]
+        self.assertEqual(
+                apic_ext.convert_nested_domain_allowed_vlans(
+                    test_dict)['vlans_list'], expt_list)
+        test_dict = {'vlan_ranges': [{'start': '11', 'end': '14'},
+                                     {'start': '6', 'end': '9'},
+                                     {'start': '8', 'end': '12'}]}
+        expt_list = [6, 7, 8, 9, 10, 11, 12, 13, 14]
+        self.assertEqual(
+                apic_ext.convert_nested_domain_allowed_vlans(
+                    test_dict)['vlans_list'], expt_list)
         self.assertIsNone(apic_ext.convert_nested_domain_allowed_vlans(None))